@@ -1,11 +1,14 @@
 from __future__ import annotations as _annotations
 
+import asyncio
+import sys
 from typing import List, Optional
 from prettytable import PrettyTable
 
 from dotenv import load_dotenv
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from pydantic_ai import Agent
+from tourist_place_store import save_tourist_places
 
 load_dotenv("../.env")
 
@@ -24,6 +27,20 @@ class TouristPlace(BaseModel):
     )
 
 
+# Build the validator for the result type once at import time and reuse it for serialization
+result_adapter = TypeAdapter(List[TouristPlace])
+
+# Column headers for the result table
+TABLE_FIELD_NAMES: List[str] = [
+    "Name",
+    "Description",
+    "Location - zip_code",
+    "Best Time to Visit",
+    "Entry Fee (USD)",
+    "Rating",
+]
+
+
 # Initialize AI model with structured validation
 travel_agent = Agent(
     "groq:llama-3.3-70b-versatile",
@@ -32,34 +49,39 @@ travel_agent = Agent(
     system_prompt="Provide 3 famous tourist places in the given city with descriptions, best time to visit, entry fee (if any), and average visitor rating.",
 )
 
-result = travel_agent.run_sync("New York City")
-print("Agent Output: \n")
 
-print(f"Data: \n {result.data} \n\n")
-print(f"Usage: \n {result.usage()} \n\n")
+async def main():
+    result = await travel_agent.run("New York City")
+    print("Agent Output: \n")
 
+    print(f"Data: \n {result_adapter.dump_json(result.data, indent=4).decode()} \n\n")
+    print(f"Usage: \n {result.usage()} \n\n")
 
-# Converting result into table format
-result_table = PrettyTable()
-result_table.field_names = [
-    "Name",
-    "Description",
-    "Location - zip_code",
-    "Best Time to Visit",
-    "Entry Fee (USD)",
-    "Rating",
-]
+    # Converting result into table format
+    result_table = PrettyTable()
+    result_table.field_names = TABLE_FIELD_NAMES
 
-for place in result.data:
-    result_table.add_row(
+    result_table.add_rows(
         [
-            place.name,
-            place.description,
-            place.zip_code,
-            place.best_time_to_visit,
-            "Free" if place.entry_fee is None else f"${place.entry_fee:.2f}",
-            place.rating,
+            [
+                place.name,
+                place.description,
+                place.zip_code,
+                place.best_time_to_visit,
+                "Free" if place.entry_fee is None else f"${place.entry_fee:.2f}",
+                place.rating,
+            ]
+            for place in result.data
         ]
     )
 
-print(result_table)
+    print(result_table)
+
+    # Optionally save the places to a JSON file passed on the command line, e.g. `python 01-1_pydantic_ai_simple_groq.py places.json`
+    if len(sys.argv) > 1:
+        save_tourist_places(sys.argv[1], result.data)
+        print(f"\nSaved {len(result.data)} places to {sys.argv[1]}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,41 @@
+from __future__ import annotations as _annotations
+
+from typing import Annotated, List, Optional, Sequence, Type, TypeVar
+
+import msgspec
+from pydantic import BaseModel
+
+# The TouristPlace model of the script using this module
+PlaceModel = TypeVar("PlaceModel", bound=BaseModel)
+
+
+# Mirror of TouristPlace used to save and load results on disk, msgspec decodes JSON much faster than pydantic
+class TouristPlaceRecord(msgspec.Struct):
+    name: str
+    description: str
+    zip_code: int
+    best_time_to_visit: str
+    rating: Annotated[float, msgspec.Meta(ge=0.0, le=5.0)]
+    entry_fee: Optional[float] = None  # Optional fields must come last in a msgspec Struct
+
+    def to_pydantic(self, model: Type[PlaceModel]) -> PlaceModel:
+        # Already validated by msgspec while decoding
+        return model.model_construct(**msgspec.structs.asdict(self))
+
+
+def save_tourist_places(path: str, places: Sequence[BaseModel]) -> None:
+    """
+    Save tourist places to a JSON file.
+    """
+    records = [TouristPlaceRecord(**place.model_dump()) for place in places]
+    with open(path, "wb") as f:
+        f.write(msgspec.json.encode(records))
+
+
+def load_tourist_places(path: str, model: Type[PlaceModel]) -> List[PlaceModel]:
+    """
+    Load tourist places saved with `save_tourist_places` as instances of `model`.
+    """
+    with open(path, "rb") as f:
+        records = msgspec.json.decode(f.read(), type=List[TouristPlaceRecord])
+    return [record.to_pydantic(model) for record in records]
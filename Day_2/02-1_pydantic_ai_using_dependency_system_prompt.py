@@ -1,8 +1,11 @@
 from __future__ import annotations as _annotations
 
-from dataclasses import dataclass
+import asyncio
+import io
+import sys
+from dataclasses import dataclass, field
 from datetime import date
-from typing import List, Optional
+from typing import Dict, List, Optional
 from prettytable import PrettyTable
 
 from dotenv import load_dotenv
@@ -17,7 +20,7 @@ load_dotenv("../.env")
 class TravelPreferences:
     location_type: Optional[str] = None  # Museums, Parks, etc.
     num_places: int = 5  # Default number of locations to return
-    current_date: date = date.today()  # Automatically set to today's date
+    current_date: date = field(default_factory=date.today)  # Automatically set to today's date
 
 
 # Define a structured response model for a tourist place
@@ -29,12 +32,16 @@ class TouristPlace(BaseModel):
     rating: float = Field(..., ge=0.0, le=5.0, description="Average rating from 0.0 to 5.0")
 
 
+# Column headers for the result table
+TABLE_FIELD_NAMES: List[str] = ["Name", "Description", "Location - zip_code", "Entry Fee (USD)", "Rating",]
+
+
 # Initialize AI model with structured validation
 travel_agent = Agent(
     "groq:llama-3.3-70b-versatile",
     model_settings={"temperature": 0.1},
     deps_type=TravelPreferences,     # Passing dependency to the AI agent
-    result_type=List[TouristPlace],  # Enforces structured output
+    result_type=Dict[str, List[TouristPlace]],  # Enforces structured output, city -> places
 )
 
 
@@ -48,16 +55,17 @@ def generate_system_prompt(ctx: RunContext[TravelPreferences]) -> str:
         f"You are an AI-powered travel guide specializing in {ctx.deps.location_type or 'all types of locations'}.\n"
         f"The current month is {month}.\n"
         f"Recommend the best tourist places to visit this month, considering seasonality.\n"
-        f"Provide structured tourist recommendations, limited to {ctx.deps.num_places} places."
+        f"For each city in the user-supplied list, return a mapping from the city name to its structured tourist recommendations, "
+        f"limited to {ctx.deps.num_places} places per city."
     )
 
 
-if __name__ == "__main__":
+async def main():
     while True:
-        city_name: str = str(input("Enter name of the city (or enter q to quite): ")).lower()
-        # User Input: New York City
+        city_names: str = str(input("Enter names of the cities, separated by commas (or enter q to quite): ")).lower()
+        # User Input: New York City, Chicago
 
-        if city_name == "q":
+        if city_names == "q":
             break
         else:
             location_type: str = str(input("Type of places interested in (for example: Museums, Parks etc.): ")).lower()
@@ -70,42 +78,56 @@ if __name__ == "__main__":
             deps_TravelPreferences = TravelPreferences(
                 location_type=location_type,
                 num_places=num_places,
-                current_date=date.today(),
             )
 
-            result = travel_agent.run_sync(city_name, deps=deps_TravelPreferences)
+            # Ask for all the cities in a single agent run
+            cities: List[str] = [city.strip() for city in city_names.split(",") if city.strip()]
+            result = await travel_agent.run(", ".join(cities), deps=deps_TravelPreferences)
+
+            # Collect the output of this iteration and write it to the terminal at once
+            output = io.StringIO()
 
             # Print system prompt
-            print(result._all_messages[0].parts[0])
+            print(result._all_messages[0].parts[0], file=output)
             # Output: SystemPromptPart(content='You are an AI-powered travel guide specializing in museums.
             # The current month is February.
             # Recommend the best tourist places to visit this month, considering seasonality.
-            # Provide structured tourist recommendations, limited to 3 places.',
+            # For each city in the user-supplied list, return a mapping from the city name to its structured tourist recommendations, limited to 3 places per city.',
             # dynamic_ref=None, 
             # part_kind='system-prompt')
 
-            print("\nAgent Output: \n")
-
-            # Converting result into table format
-            result_table = PrettyTable()
-            result_table.field_names = ["Name", "Description", "Location - zip_code", "Entry Fee (USD)", "Rating",]
+            print("\nAgent Output: \n", file=output)
 
-            for place in result.data:
-                result_table.add_row(
+            # Converting result into one table per city
+            for city, places in result.data.items():
+                result_table = PrettyTable()
+                result_table.title = city
+                result_table.field_names = TABLE_FIELD_NAMES
+                result_table.add_rows(
                     [
-                        place.name,
-                        place.description,
-                        place.zip_code,
-                        "Free"
-                        if place.entry_fee is None
-                        else f"${place.entry_fee:.2f}",
-                        place.rating,
+                        [
+                            place.name,
+                            place.description,
+                            place.zip_code,
+                            "Free"
+                            if place.entry_fee is None
+                            else f"${place.entry_fee:.2f}",
+                            place.rating,
+                        ]
+                        for place in places
                     ]
                 )
 
-            print(result_table)
+                print(result_table, file=output)
+
+            sys.stdout.write(output.getvalue())
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
 
-# Output:
+# Output (one table per city):
 # +------------------------------------+-------------------------------------------------------------------------------------------------------------------------------------------+---------------------+-----------------+--------+
 # |                Name                |                                                                Description                                                                | Location - zip_code | Entry Fee (USD) | Rating |
 # +------------------------------------+-------------------------------------------------------------------------------------------------------------------------------------------+---------------------+-----------------+--------+
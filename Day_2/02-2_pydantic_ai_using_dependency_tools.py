@@ -1,25 +1,37 @@
 from __future__ import annotations as _annotations
 
+import asyncio
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
 from typing import List, Dict, Any
 from datetime import datetime
 from tabulate import tabulate
 
 
-import requests
+import httpx
+from aioconsole import ainput
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field, SecretStr
 from pydantic_ai import Agent, RunContext, UserError
 
+from config.http import fetch, http_client, parse_json
+from config.timeouts import TIMEOUTS
+
 load_dotenv("../.env")
 
+# Fetch API key from environment variables once, at startup
+WEATHERSTACK_API_KEY = SecretStr(os.environ["WEATHERSTACK_API_KEY"])
+
+# Fields of the WeatherStack response that are passed on to the model
+LOCATION_FIELDS = ("name", "country", "lat", "lon", "localtime")
+CURRENT_WEATHER_FIELDS = ("temperature", "weather_descriptions", "feelslike", "precip")
+
 
 # Define dependencies
 @dataclass
 class WeatherDeps:
-    current_date: date = date.today()  # Automatically set to today's date
+    current_date: date = field(default_factory=date.today)  # Automatically set to today's date
     weatherstack_api_key: SecretStr | None = None  # API key for WeatherStack
 
 
@@ -37,7 +49,7 @@ class WeatherDetails(BaseModel):
 # Initialize AI model with structured validation
 weather_agent = Agent(
     "groq:llama-3.3-70b-versatile",
-    model_settings={"temperature": 0.1},
+    model_settings={"temperature": 0.1, "timeout": TIMEOUTS.llm_call},
     result_type=WeatherDetails,  # Enforces structured output
     deps_type=WeatherDeps,
     system_prompt="As a weather agent, provide detailed current weather information for any location requested, including temperature, conditions (clear, sunny, cloudy, rainy), and any relevant weather alerts, when asked. Always provide the most accurate and up-to-date data using `get_current_weather_details` tool.",
@@ -45,7 +57,7 @@ weather_agent = Agent(
 
 
 @weather_agent.tool
-def get_current_weather_details(ctx: RunContext[WeatherDeps], city_name: str) -> Dict[str, Any]:
+async def get_current_weather_details(ctx: RunContext[WeatherDeps], city_name: str) -> Dict[str, Any]:
     """
     Retrieve current weather details for the specified city.
 
@@ -57,42 +69,77 @@ def get_current_weather_details(ctx: RunContext[WeatherDeps], city_name: str) ->
         raise UserError("WeatherStack API key is required to get weather details")
 
     # Build API request
-    url = f"https://api.weatherstack.com/current?access_key={ctx.deps.weatherstack_api_key}"
+    url = f"https://api.weatherstack.com/current?access_key={ctx.deps.weatherstack_api_key.get_secret_value()}"
     querystring: dict[str, str] = {"query": city_name}
 
     # Fetch weather data
-    response = requests.get(url, params=querystring)
+    response = await fetch(url, params=querystring)
 
     # Convert the JSON string to a Python dictionary
-    # data: Dict[str, Any] = response.json()
+    data: Dict[str, Any] = parse_json(response)
+
+    # Error messages are returned as is
+    if "location" not in data or "current" not in data:
+        return data
+
+    # Keep only the fields needed for WeatherDetails to save tokens
+    return {
+        "location": {k: data["location"][k] for k in LOCATION_FIELDS if k in data["location"]},
+        "current": {k: data["current"][k] for k in CURRENT_WEATHER_FIELDS if k in data["current"]},
+    }
+
+
+async def prewarm_connection() -> None:
+    """
+    Open the connection to WeatherStack while the user is still typing, so the tool call can reuse it.
+    """
+    try:
+        await http_client.head("https://api.weatherstack.com/")
+    except httpx.HTTPError:
+        pass  # Only a warm up, the tool call reports real failures
+
+
+async def main():
+    try:
+        await repl()
+    finally:
+        await http_client.aclose()
+
+
+async def repl():
+    prewarm: asyncio.Task[None] | None = None
+
+    try:
+        while True:
+            # Open the connection, or refresh the pooled one, while the user is typing the city name
+            prewarm = asyncio.create_task(prewarm_connection())
+
+            city_name: str = str(await ainput("Enter name of the city (or enter q to quite): ")).lower()
+            # User Input: New York City
+
+            if city_name == "q":
+                break
+            else:
+                # Prepare dependencies
+                deps = WeatherDeps(
+                    weatherstack_api_key=WEATHERSTACK_API_KEY,
+                )
+
+                # Run the agent
+                # city_name = "New York City"
+                result = await weather_agent.run(city_name, deps=deps)
 
-    return response.json()
+                # Display results
+                print("\nAgent Output: \n")
+                print(tabulate(result.data))
+    finally:
+        # Stop a warm up that is still running when the user quits
+        if prewarm is not None:
+            prewarm.cancel()
 
 
 if __name__ == "__main__":
-    while True:
-        city_name: str = str(input("Enter name of the city (or enter q to quite): ")).lower()
-        # User Input: New York City
-
-        if city_name == "q":
-            break
-        else:
-            # Fetch API key from environment variables
-            weatherstack_api_key: SecretStr = os.getenv("WEATHERSTACK_API_KEY")
-
-            # Prepare dependencies
-            deps = WeatherDeps(
-                current_date=date.today(),
-                weatherstack_api_key=weatherstack_api_key,
-            )
-
-            # Run the agent
-            # city_name = "New York City"
-            result = weather_agent.run_sync(city_name, deps=deps)
-
-            # Display results
-            print("\nAgent Output: \n")
-            print(tabulate(result.data))
+    asyncio.run(main())
 
 # Agent Output:
 # --------------------  -------------------
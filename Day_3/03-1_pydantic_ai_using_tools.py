@@ -1,31 +1,49 @@
 from __future__ import annotations as _annotations
 
 
-import requests
+import asyncio
+import httpx
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from datetime import date
-from typing import List, Dict, Any
+from typing import Any, Awaitable, Dict, List, Tuple
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
 from pydantic import BaseModel, Field, SecretStr
-from pydantic_ai import Agent, RunContext
+from pydantic_ai import Agent, RunContext, UserError
 from duckduckgo_search import DDGS
 
 import logfire
 from dotenv import load_dotenv
 
+from config.http import fetch, http_client, parse_json
+from config.timeouts import TIMEOUTS
+
 
 load_dotenv("../.env")
 
-logfire.configure()
+# Fetch API key from environment variables once, at startup
+ALPHA_VANTAGE_API_KEY = SecretStr(os.environ["ALPHA_VANTAGE_API_KEY"])
+
+# Keep every trace while developing, lower LOGFIRE_HEAD_SAMPLE_RATE (e.g. 0.1) to sample traces in production
+logfire.configure(sampling=logfire.SamplingOptions(head=float(os.getenv("LOGFIRE_HEAD_SAMPLE_RATE") or 1.0)))
+
+# Shared DuckDuckGo search session, set up once instead of on every lookup
+ddgs = DDGS()
+
+# Fields of the Alpha Vantage responses that are passed on to the model
+STOCK_PRICE_FIELDS = ("01. symbol", "05. price", "07. latest trading day", "08. previous close", "09. change", "10. change percent")
+COMPANY_OVERVIEW_FIELDS = ("Symbol", "Name", "Description", "Exchange", "Sector", "Industry", "MarketCapitalization", "52WeekHigh", "52WeekLow")
+COMPANY_NEWS_FIELDS = ("title", "summary", "source", "overall_sentiment_label")
+
 
 # Define dependencies
 @dataclass
 class Deps:
-    current_date: date = date.today()  # Automatically set to today's date
+    current_date: date = field(default_factory=date.today)  # Automatically set to today's date
     alpha_vantage_api_key: SecretStr | None = None  # API key for WeatherStack
 
 # Define a structured response model for stock details
@@ -51,21 +69,31 @@ class CompanyNews(BaseModel):
 
 market_research_agent = Agent(
     "google-gla:gemini-2.5-pro-exp-03-25", 
-    model_settings={"temperature": 0},
+    model_settings={"temperature": 0, "timeout": TIMEOUTS.llm_call},
     result_type=StockDetails,
     deps_type=Deps,
     system_prompt="""As an AI agent with stock market knowledge, you will provide up-to-date stock market related details about the company.
         Follow the below steps and guidelines: 
         step 1: Use the `get_stock_ticker_symbol` tool to get the stock ticker symbol for the company, 
-        step 2: Use the `get_current_stock_price` tool to fetch the current stock price of a given company, 
-        step 3: Use the `get_company_overview_and_financials` tool to get company details and other financial data like sector, industry, market capitalization, stock exchange, 52 week high and low price. 
-        step 4: Use the `get_company_news` tool to fetch the latest news about the company.
-        step 5: Use the information returned by these tools to provide the stock details about the company. 
+        step 2: Once the ticker is known, use the `get_company_bundle` tool to fetch the current stock price, company details and other financial data like sector, industry, market capitalization, stock exchange, 52 week high and low price, and the latest news about the company in a single call.
+        step 3: Use the information returned by these tools to provide the stock details about the company. 
         You must always provide the most accurate and up-to-date data using the above tools only. Do not fall back to generic knowledge or assumptions.""",
     retries=3,
 )
 
 
+@lru_cache(maxsize=1024)
+def search_stock_ticker_symbol(company_name: str) -> List[Dict[str, str]]:
+    """Search DuckDuckGo for the stock ticker symbol of a company, caching results by company name
+
+    Args:
+        company_name: Normalized name of the company
+    """
+
+    results: List[Dict[str, str]] = ddgs.text(f"What is stock ticker symbol for {company_name}", max_results=5)
+    return results
+
+
 # Tool without run context
 @market_research_agent.tool_plain(retries=3)
 async def get_stock_ticker_symbol(company_name: str) -> List[Dict[str, str]]:
@@ -75,72 +103,134 @@ async def get_stock_ticker_symbol(company_name: str) -> List[Dict[str, str]]:
         company_name: Name of the company
     """
 
-    logfire.info(f"DuckDuckGo Search: {company_name}")
+    logfire.info("DuckDuckGo Search: {company_name}", company_name=company_name)
 
-    results: List[Dict[str, str]] = DDGS().text(f"What is stock ticker symbol for {company_name}", max_results=5)
-    return results
+    # Normalize the name so that "Apple" and " apple " share a cache entry, and run the
+    # blocking DuckDuckGo search in a worker thread so cache misses do not stall the event loop
+    return await asyncio.to_thread(search_stock_ticker_symbol, company_name.strip().lower())
 
 
-# Tool with run context
-@market_research_agent.tool
-async def get_current_stock_price(ctx: RunContext[Deps], ticker: str) -> Dict[str, Any]:
+async def get_current_stock_price(ticker: str, api_key: SecretStr) -> Dict[str, Any]:
     """Fetch the current stock price of a given company
 
     Args:
         ticker: Stock ticker symbol for a company
+        api_key: Alpha Vantage API key
     """
 
-    logfire.info(f"Get current stock price of the company from alphavantage: {ticker}")
-    
-    url: str = f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol={ticker}&apikey={ctx.deps.alpha_vantage_api_key}"
-    stock_price = requests.get(url)
-    # print(stock_price.text)
-    return stock_price.text
+    logfire.info("Get current stock price of the company from alphavantage: {ticker}", ticker=ticker)
 
+    url: str = f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol={ticker}&apikey={api_key.get_secret_value()}"
+    response = await fetch(url)
+    data: Dict[str, Any] = parse_json(response)
 
-# Tool with run context
-@market_research_agent.tool
-async def get_company_overview_and_financials(ctx: RunContext[Deps], ticker: str) -> Dict[str, Any]:
+    # Error and rate limit messages are returned as is
+    stock_price: Dict[str, Any] | None = data.get("Global Quote")
+    if not stock_price:
+        return data
+    return {k: stock_price[k] for k in STOCK_PRICE_FIELDS if k in stock_price}
+
+
+async def get_company_overview_and_financials(ticker: str, api_key: SecretStr) -> Dict[str, Any]:
     """Get company details and other financial data
 
     Args:
         ticker: Stock ticker symbol for a company
+        api_key: Alpha Vantage API key
     """
 
-    logfire.info(f"Get company details and other financial data of the company from alphavantage: {ticker}")
-    
-    url = f"https://www.alphavantage.co/query?function=OVERVIEW&symbol={ticker}&apikey={ctx.deps.alpha_vantage_api_key}"
-    company_overview = requests.get(url)
-    # print(company_overview.text)
-    return company_overview.text
+    logfire.info("Get company details and other financial data of the company from alphavantage: {ticker}", ticker=ticker)
+
+    url = f"https://www.alphavantage.co/query?function=OVERVIEW&symbol={ticker}&apikey={api_key.get_secret_value()}"
+    response = await fetch(url)
+    data: Dict[str, Any] = parse_json(response)
+
+    # Error and rate limit messages are returned as is
+    if "Symbol" not in data:
+        return data
+    return {k: data[k] for k in COMPANY_OVERVIEW_FIELDS if k in data}
+
+
+async def get_company_news(ticker: str, api_key: SecretStr) -> Dict[str, Any]:
+    """Get the latest news headlines for a given company.
+
+    Args:
+        ticker: Stock ticker symbol for a company
+        api_key: Alpha Vantage API key
+    """
+
+    logfire.info("Get the latest news headlines for a given company from alphavantage: {ticker}", ticker=ticker)
+
+    url = f"https://www.alphavantage.co/query?function=NEWS_SENTIMENT&tickers={ticker}&limit=5&sort=RELEVANCE&apikey={api_key.get_secret_value()}"
+    response = await fetch(url)
+    data: Dict[str, Any] = parse_json(response)
+
+    # Error and rate limit messages are returned as is
+    if "feed" not in data:
+        return data
+    return {
+        "feed": [
+            {k: article[k] for k in COMPANY_NEWS_FIELDS if k in article}
+            for article in data["feed"]
+        ]
+    }
 
 
 # Tool with run context
 @market_research_agent.tool
-async def get_company_news(ctx: RunContext[Deps], ticker: str) -> Dict[str, Any]:
-    """Get the latest news headlines for a given company.
+async def get_company_bundle(ctx: RunContext[Deps], ticker: str) -> Dict[str, Any]:
+    """Get the current stock price, company overview with financials and the latest news for a given company.
 
     Args:
         ticker: Stock ticker symbol for a company
     """
 
-    logfire.info(f"Get the latest news headlines for a given company from alphavantage: {ticker}")
-    
-    url = f"https://www.alphavantage.co/query?function=NEWS_SENTIMENT&tickers={ticker}&limit=5&sort=RELEVANCE&apikey={ctx.deps.alpha_vantage_api_key}"
-    company_news = requests.get(url)
-    # print(company_news.text)
-    return company_news.text
+    if ctx.deps.alpha_vantage_api_key is None:
+        raise UserError("Alpha Vantage API key is required to get stock details")
+
+    api_key = ctx.deps.alpha_vantage_api_key
+
+    async def lookup(name: str, coro: Awaitable[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+        # A failed lookup is reported in its own slot, so the other results are still returned
+        try:
+            return name, await coro
+        except httpx.HTTPError as exc:
+            return name, {"error": f"{type(exc).__name__}: {exc}"}
+
+    # The three lookups only depend on the ticker, so run them concurrently
+    tasks = [
+        asyncio.create_task(lookup("stock_price", get_current_stock_price(ticker, api_key))),
+        asyncio.create_task(lookup("company_overview", get_company_overview_and_financials(ticker, api_key))),
+        asyncio.create_task(lookup("company_news", get_company_news(ticker, api_key))),
+    ]
+
+    # Fill in the bundle as each lookup finishes, so a slow one does not hold back the others past the deadline
+    bundle: Dict[str, Any] = {}
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=TIMEOUTS.tool_call):
+            name, data = await next_done
+            bundle[name] = data
+    except asyncio.TimeoutError:
+        for name in ("stock_price", "company_overview", "company_news"):
+            bundle.setdefault(name, {"error": f"Timed out after {TIMEOUTS.tool_call} seconds"})
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    return bundle
 
-    
-if __name__ == "__main__":
-    alpha_vantage_api_key: SecretStr = os.getenv("ALPHA_VANTAGE_API_KEY")
-    # Run the agent
-    result = market_research_agent.run_sync('Provide details about company Apple', deps=Deps(alpha_vantage_api_key=alpha_vantage_api_key))
-    data = result.data
-    
-    # Initialize Console
-    console = Console()
 
+# Cap concurrent agent runs to stay within the provider rate limits
+semaphore = asyncio.Semaphore(8)
+
+
+async def research_company(company_name: str, deps: Deps) -> StockDetails:
+    async with semaphore:
+        result = await market_research_agent.run(f"Provide details about company {company_name}", deps=deps)
+    return result.data
+
+
+def print_stock_details(console: Console, data: StockDetails) -> None:
     # Format Company Overview
     company_info = f"""[bold]Company Overview of {data.company_name} ({data.ticker})[/bold]\n
     [bold]Name:[/bold] {data.company_name}\n
@@ -167,3 +257,26 @@ if __name__ == "__main__":
         news_table.add_row(news.title, news.Summary, news.overall_sentiment, news.source)
 
     console.print(news_table)
+
+
+async def main():
+    deps = Deps(alpha_vantage_api_key=ALPHA_VANTAGE_API_KEY)
+
+    # Run the agent for every company concurrently
+    companies: List[str] = ["Apple"]
+    try:
+        results: List[StockDetails] = await asyncio.gather(
+            *[research_company(company_name, deps) for company_name in companies]
+        )
+    finally:
+        await http_client.aclose()
+
+    # Initialize Console
+    console = Console()
+
+    for data in results:
+        print_stock_details(console, data)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
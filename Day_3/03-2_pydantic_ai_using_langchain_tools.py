@@ -1,5 +1,8 @@
 from __future__ import annotations as _annotations
 
+import asyncio
+import os
+from functools import lru_cache
 from typing import Dict, List
 
 import logfire
@@ -10,7 +13,27 @@ from pydantic_ai import Agent
 
 load_dotenv("../.env")
 
-logfire.configure()
+# Head sampling rate for traces, same setting as in 03-1
+logfire.configure(sampling=logfire.SamplingOptions(head=float(os.getenv("LOGFIRE_HEAD_SAMPLE_RATE") or 1.0)))
+
+# Shared DuckDuckGo search session, set up once instead of on every lookup
+ddgs = DDGS()
+
+# Shared Yahoo Finance news tool
+yahoo_finance_news = YahooFinanceNewsTool()
+
+
+@lru_cache(maxsize=1024)
+def search_stock_ticker_symbol(company_name: str) -> List[Dict[str, str]]:
+    """Search DuckDuckGo for the stock ticker symbol of a company, caching results by company name
+
+    Args:
+        company_name: Normalized name of the company
+    """
+
+    results: List[Dict[str, str]] = ddgs.text(f"What is stock ticker symbol for {company_name}", max_results=5)
+    return results
+
 
 async def get_stock_ticker_symbol(company_name: str) -> List[Dict[str, str]]:
     """Stock ticker symbol for a company
@@ -19,10 +42,11 @@ async def get_stock_ticker_symbol(company_name: str) -> List[Dict[str, str]]:
         company_name: Name of the company
     """
 
-    logfire.info(f"DuckDuckGo Search: {company_name}")
+    logfire.info("DuckDuckGo Search: {company_name}", company_name=company_name)
 
-    results: List[Dict[str, str]] = DDGS().text(f"What is stock ticker symbol for {company_name}", max_results=5)
-    return results
+    # Normalize the name so that "Apple" and " apple " share a cache entry, and run the
+    # blocking DuckDuckGo search in a worker thread so cache misses do not stall the event loop
+    return await asyncio.to_thread(search_stock_ticker_symbol, company_name.strip().lower())
 
 
 async def get_latest_financial_news(ticker: str) -> str:
@@ -32,9 +56,10 @@ async def get_latest_financial_news(ticker: str) -> str:
         ticker: Stock ticker symbol for a company
     """
 
-    logfire.info(f"Yahoo Finance News: {ticker}")
+    logfire.info("Yahoo Finance News: {ticker}", ticker=ticker)
 
-    finance_news = YahooFinanceNewsTool().run(ticker)
+    # The langchain tool is synchronous, run it in a worker thread to keep the event loop free
+    finance_news = await asyncio.to_thread(yahoo_finance_news.run, ticker)
     
     print(finance_news)
     return finance_news
@@ -54,7 +79,14 @@ finance_agent = Agent(
         tools=[get_stock_ticker_symbol, get_latest_financial_news],
 )
 
+
+async def main():
+    # Run the agent and print the response as it is generated
+    async with finance_agent.run_stream('Provide latest news about Google') as result:
+        async for chunk in result.stream_text(delta=True):
+            print(chunk, end="", flush=True)
+    print()
+
+
 if __name__ == "__main__":
-    # Run the agent
-    result = finance_agent.run_sync('Provide latest news about Google')
-    print(result.data)
\ No newline at end of file
+    asyncio.run(main())
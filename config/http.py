@@ -0,0 +1,41 @@
+from __future__ import annotations as _annotations
+
+from typing import Any, Dict
+
+import httpx
+import orjson
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+from config.timeouts import TIMEOUTS
+
+
+# Shared HTTP client: keep-alive connections to the external APIs are reused across tool calls.
+# Idle connections are kept for 2 minutes (httpx default is 5 s) so they survive the gaps between agent runs
+http_client = httpx.AsyncClient(
+    http2=True,
+    timeout=httpx.Timeout(TIMEOUTS.http_read, connect=TIMEOUTS.http_connect),
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=120.0),
+)
+
+# Retry requests that time out or fail to connect, backing off exponentially between attempts
+retry_on_transport_error = retry(
+    retry=retry_if_exception_type(httpx.TransportError),
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, max=8),
+    reraise=True,
+)
+
+
+@retry_on_transport_error
+async def fetch(url: str, params: Dict[str, str] | None = None) -> httpx.Response:
+    return await http_client.get(url, params=params)
+
+
+def parse_json(response: httpx.Response) -> Dict[str, Any]:
+    """Parse a JSON response, passing error pages and non-JSON bodies on to the model as an error"""
+    if not response.is_success:
+        return {"error": response.text}
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError:
+        return {"error": response.text}
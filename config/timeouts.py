@@ -0,0 +1,15 @@
+from __future__ import annotations as _annotations
+
+from dataclasses import dataclass
+
+
+# Timeouts (in seconds) shared by all the tutorial scripts
+@dataclass(frozen=True)
+class TimeoutConfig:
+    http_connect: float = 5.0  # Establishing a connection to an external API
+    http_read: float = 15.0  # Waiting for an external API to send data
+    llm_call: float = 45.0  # A single request to the LLM provider
+    tool_call: float = 30.0  # All the API requests made by one tool call, including retries
+
+
+TIMEOUTS = TimeoutConfig()